@@ -1 +1,2 @@
-CONFIG_PATH = "config/config.yaml"
\ No newline at end of file
+CONFIG_PATH = "config/config.yaml"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
\ No newline at end of file
@@ -1,16 +1,125 @@
-from extras.constants import CONFIG_PATH
+import os
+from functools import lru_cache
+from extras.constants import CONFIG_PATH, IMAGE_EXTENSIONS
 from preprocessor.extract import Processor
 from extras.utils import read_yaml
 from omission.extract_omission import OmissionExtractor
-from omission.check_omission import MedicalOmissionChecker
+from omission.check_omission import MedicalOmissionChecker, ConsistencyCheck
+from omission.models import MedicalOmissionInfo
+from storage.journal import Journal
+
+
+@lru_cache(maxsize=None)
+def get_processor():
+    """Builds the OCR processor on first use; the model is slow to load and only needed if some asset still needs OCR."""
+    return Processor()
+
+
+def collect_assets(marketing_docs):
+    """
+    Expands the configured marketing document(s) into a list of file paths.
+    Folders contribute only the image files they directly contain, since those are
+    the assets the OCR stage can read.
+    """
+    if isinstance(marketing_docs, str):
+        marketing_docs = [marketing_docs]
+
+    assets = []
+    for path in marketing_docs:
+        if os.path.isdir(path):
+            assets.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if os.path.isfile(os.path.join(path, name))
+                and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+            ))
+        else:
+            assets.append(path)
+    return assets
+
+
+def review_asset(path, key, journal, checker, omission_extractor):
+    """
+    Runs the review pipeline for one asset, skipping every stage already recorded in the journal.
+    Only image assets are supported: PDF partitions cannot be cleaned into post text.
+
+    Args:
+        path (str): Path to the marketing image.
+        key (str): Journal key of the asset, from Journal.asset_key.
+
+    Returns:
+        dict: Verdicts per category, as produced by MedicalOmissionChecker.check_documents.
+    """
+    stages = journal.load(key)["stages"]
+
+    if "ocr" not in stages:
+        if os.path.splitext(path)[1].lower() not in IMAGE_EXTENSIONS:
+            raise ValueError(f"Unsupported marketing document type: '{path}'. Expected one of {IMAGE_EXTENSIONS}.")
+        ocr_output = get_processor().extract(path)
+        if ocr_output is None:
+            raise ValueError(f"No OCR output for '{path}'.")
+        stages["ocr"] = ocr_output
+        journal.record(key, "ocr", stages["ocr"], source=path)
+
+    if "cleaned_text" not in stages:
+        stages["cleaned_text"] = get_processor().clean_text(stages["ocr"])
+        journal.record(key, "cleaned_text", stages["cleaned_text"])
+
+    if "omission_info" not in stages:
+        observation_info = omission_extractor.extract(stages["cleaned_text"])
+        stages["omission_info"] = observation_info.model_dump()
+        journal.record(key, "omission_info", stages["omission_info"])
+    observation_info = MedicalOmissionInfo.model_validate(stages["omission_info"])
+
+    if "retrieved_documents" not in stages:
+        stages["retrieved_documents"] = checker.retrieve_documents(observation_info)
+        journal.record(key, "retrieved_documents", stages["retrieved_documents"])
+
+    if "verdicts" not in stages:
+        # Journal each verdict as it arrives, so a rate limit part-way through keeps the ones already paid for.
+        previous_results = {
+            category: {observation: ConsistencyCheck.model_validate(check) for observation, check in checks.items()}
+            for category, checks in journal.load_items(key, "verdicts").items()
+        }
+        results = checker.check_documents(
+            stages["cleaned_text"],
+            journal.resolve_blobs(stages["retrieved_documents"]),
+            previous_results=previous_results,
+            on_result=lambda category, observation, check: journal.record_item(
+                key, "verdicts", category, observation, check.model_dump()
+            ),
+        )
+        stages["verdicts"] = {
+            category: [(observation, check.model_dump()) for observation, check in checks]
+            for category, checks in results.items()
+        }
+        journal.record(key, "verdicts", stages["verdicts"])
+
+    return {
+        category: [(observation, ConsistencyCheck.model_validate(check)) for observation, check in checks]
+        for category, checks in stages["verdicts"].items()
+    }
+
 
 if __name__ == "__main__":
     config = read_yaml(CONFIG_PATH)
-    processor = Processor()
+    journal = Journal(config.get("journal_dir", ".journal"))
     checker = MedicalOmissionChecker(collection_name=config.get("collection_name"))
     omission_extractor = OmissionExtractor()
-    marketing_post_text = processor.extract(config.get("marketing_doc"))
-    marketing_post_text_cleaned = processor.clean_text(marketing_post_text)
-    observation_info = omission_extractor.extract(marketing_post_text_cleaned)
-    results = checker.process_observation(marketing_post_text_cleaned,observation_info)
-    checker.display_results(results)
\ No newline at end of file
+
+    failed = []
+    for path in collect_assets(config.get("marketing_doc")):
+        print(f"\nReviewing: {path}")
+        try:
+            key = Journal.asset_key(path)
+            if journal.is_complete(key):
+                print("Already reviewed, loading results from the journal.")
+            results = review_asset(path, key, journal, checker, omission_extractor)
+        except Exception as e:
+            # Completed stages are journaled; once the cause is fixed, a rerun resumes this asset where it stopped.
+            print(f"Error reviewing '{path}': {e}")
+            failed.append(path)
+            continue
+        checker.display_results(results)
+
+    if failed:
+        print(f"\n{len(failed)} asset(s) failed; rerun to resume them from their last completed stage: {failed}")
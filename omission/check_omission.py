@@ -1,4 +1,5 @@
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from extras.constants import CONFIG_PATH
 from extras.utils import read_yaml
 from pydantic import BaseModel
@@ -25,13 +26,25 @@ class MedicalOmissionChecker:
         self.vector_store.set_collection()
         self.client = OpenAI()
 
-    def _query_observation(self, observations: List[str]) -> Dict[str, List[str]]:
-        """Query Aperture DB for each claim and return relevant documents."""
-        relevant_docs = {}
-        for observation in observations:
-            embeddings = get_multimodal_embedding(observation)
-            documents = self.vector_store.query_embeddings(embeddings)
-            relevant_docs[observation] = documents
+    def _query_observation(self, observation_categories: Dict[str, List[str]]) -> Dict[str, Dict[str, list]]:
+        """Query Aperture DB for every claim of every category in parallel and return relevant documents per category."""
+        relevant_docs = {category: {} for category in observation_categories}
+        pairs = [
+            (category, observation)
+            for category, observations in observation_categories.items()
+            for observation in observations
+        ]
+        if not pairs:
+            return relevant_docs
+
+        # Encode in one batch on this thread; the embedding model is not safe to share across threads.
+        embeddings = get_multimodal_embedding([observation for _, observation in pairs])
+
+        with ThreadPoolExecutor(max_workers=self.vector_store.pool.size) as executor:
+            documents = list(executor.map(self.vector_store.query_embeddings, embeddings))
+
+        for (category, observation), docs in zip(pairs, documents):
+            relevant_docs[category][observation] = docs
         return relevant_docs
 
     def _check_consistency(self, post: str, observation: str, category: str, documents: list[str]) -> ConsistencyCheck:
@@ -70,9 +83,8 @@ class MedicalOmissionChecker:
         return response.output_parsed
 
 
-    def process_observation(self, post:str, observation_info: MedicalOmissionInfo) -> Dict[str, List[Tuple[str, str]]]:
-        """Process all observation, cross-reference with Aperture DB, and check consistency."""
-        results = {}
+    def retrieve_documents(self, observation_info: MedicalOmissionInfo) -> Dict[str, Dict[str, list]]:
+        """Query Aperture DB for every observation, grouped by category."""
         observation_categories = {
             "omitted_side_effects_and_risks": observation_info.omitted_side_effects_and_risks,
             "omitted_contraindications": observation_info.omitted_contraindications,
@@ -81,21 +93,46 @@ class MedicalOmissionChecker:
             "omitted_clinical_evidence": observation_info.omitted_clinical_evidence,
         }
 
-        for category, observations in observation_categories.items():
-            if not observations:
-                results[category] = [("No observation provided", "No documents found")]
+        return self._query_observation(observation_categories)
+
+    def check_documents(
+        self,
+        post: str,
+        retrieved_docs: Dict[str, Dict[str, list]],
+        previous_results: Dict[str, Dict[str, ConsistencyCheck]] = None,
+        on_result: Callable[[str, str, ConsistencyCheck], None] = None,
+    ) -> Dict[str, List[Tuple[str, ConsistencyCheck]]]:
+        """
+        Check every observation against its retrieved documents.
+
+        Args:
+            previous_results: Verdicts already made, as {category: {observation: check}}; these are reused instead of asking the LLM again.
+            on_result: Called with (category, observation, check) after each new LLM verdict.
+        """
+        previous_results = previous_results or {}
+        results = {}
+        for category, relevant_docs in retrieved_docs.items():
+            if not relevant_docs:
+                results[category] = [("No observation provided", ConsistencyCheck(status="No documents found", reason="No observation provided"))]
                 continue
 
-            relevant_docs = self._query_observation(observations)
             category_results = []
 
             for observation, documents in relevant_docs.items():
-                consistency = self._check_consistency(post, observation, category, documents)
+                consistency = previous_results.get(category, {}).get(observation)
+                if consistency is None:
+                    consistency = self._check_consistency(post, observation, category, documents)
+                    if on_result:
+                        on_result(category, observation, consistency)
                 category_results.append((observation, consistency))
 
             results[category] = category_results
 
         return results
+
+    def process_observation(self, post:str, observation_info: MedicalOmissionInfo) -> Dict[str, List[Tuple[str, ConsistencyCheck]]]:
+        """Process all observation, cross-reference with Aperture DB, and check consistency."""
+        return self.check_documents(post, self.retrieve_documents(observation_info))
     
     def display_results(self, results: Dict[str, List[Tuple[str, "ConsistencyCheck"]]]):
         """
@@ -1,4 +1,5 @@
 from unstructured.partition.pdf import partition_pdf
+from extras.constants import IMAGE_EXTENSIONS
 import easyocr
 import os
 
@@ -38,7 +39,7 @@ class Processor():
 
             file_extension = os.path.splitext(document)[1].lower()
 
-            if file_extension in ['.png', '.jpg', '.jpeg']:  # Supported image formats
+            if file_extension in IMAGE_EXTENSIONS:  # Supported image formats
                 # Use easyOCR for image processing
                 #preprocessed_image = self.preprocess_image(document) #Not giving good results
                 result = self.model.readtext(document)
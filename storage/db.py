@@ -1,30 +1,42 @@
-from aperturedb import Connector
 import numpy as np
 from nomic import embed
-from aperturedb.CommonLibrary import create_connector
-from dotenv import load_dotenv
+from storage.pool import ConnectionPool, get_pool
 
-load_dotenv()
 class VectorStore:
-    def __init__(self, collection_name: str):
+    def __init__(self, collection_name: str, pool: ConnectionPool = None):
         """
-        Initializes the ApertureDB client.
+        Initializes the store on top of the shared ApertureDB connection pool.
+        Connections are opened lazily, so construction does not touch the database.
+        A VectorStore may be used from several threads at once; every query runs
+        on its own pooled connection.
 
-        :param host: The database instance name or IP (without http://).
-        :param user: Username for authentication.
-        :param password: Password for authentication.
+        :param collection_name: Name of the descriptor set.
+        :param pool: Connection pool to use. Defaults to the process-wide pool.
         """
-        self.client = create_connector(key = os.getenv("APERTUREDB_API_KEY"))
-        self.client.query([{"GetStatus": {}}])  # Verify connection
+        self.pool = pool if pool is not None else get_pool()
         self.descriptorset_name = collection_name
 
     def set_collection(self, dimensions: int = 512):
         """
         Sets the descriptor set (collection) to be used. If it doesn't exist, it creates one.
+        Existence is cached per process, so only the first call talks to the database.
 
-        :param collection_name: Name of the descriptor set.
         :param dimensions: Dimensionality of the embeddings.
+        :return: True if the descriptor set exists or was created, False if creating it failed.
         """
+        if self.pool.is_known_collection(self.descriptorset_name):
+            return True
+
+        responses, _ = self.pool.query([{
+            "FindDescriptorSet": {
+                "with_name": self.descriptorset_name,
+                "results": {"count": True}
+            }
+        }])
+        if responses and responses[0].get("FindDescriptorSet", {}).get("count", 0) > 0:
+            self.pool.mark_collection(self.descriptorset_name)
+            return True
+
         q = [{
             "AddDescriptorSet": {
                 "name": self.descriptorset_name,
@@ -37,7 +49,13 @@ class VectorStore:
                 }
             }
         }]
-        return self.client.query(q)
+        responses, _ = self.pool.query(q)
+        if not responses or responses[0].get("AddDescriptorSet", {}).get("status") != 0:
+            print(f"❌ Failed to create descriptor set '{self.descriptorset_name}': {responses}")
+            return False
+
+        self.pool.mark_collection(self.descriptorset_name)
+        return True
 
     def ingest_embeddings(self, embeddings: np.ndarray, ids: list, metadatas: list = None):
         """
@@ -70,7 +88,7 @@ class VectorStore:
             blobs.append(embedding)
         
         print(len(blobs))
-        return self.client.query(queries, blobs)
+        return self.pool.query(queries, blobs)
     
     def query_embeddings(self, query_embedding: np.ndarray, top_k: int = 5, return_images: bool = True):
         if self.descriptorset_name is None:
@@ -92,18 +110,22 @@ class VectorStore:
             }
         }]
 
-        responses, blobs = self.client.query(q, [embedding_blob])
-        print("responses", responses, "blobs", blobs)
-        
-        # Check if the query was successful
-        if not responses or "FindDescriptor" not in responses[0]:
-            return []
-        
-        # Handle case where no descriptors are found
-        descriptors = responses[0]["FindDescriptor"].get("entities", [])
-        if not descriptors:
-            return []
+        with self.pool.connection() as client:
+            responses, blobs = client.query(q, [embedding_blob])
+            print("responses", responses, "blobs", blobs)
+
+            # Check if the query was successful
+            if not responses or "FindDescriptor" not in responses[0]:
+                return []
+
+            # Handle case where no descriptors are found
+            descriptors = responses[0]["FindDescriptor"].get("entities", [])
+            if not descriptors:
+                return []
+
+            return self._collect_results(client, descriptors, return_images)
 
+    def _collect_results(self, client, descriptors: list, return_images: bool):
         results = []
         for d in descriptors:
             # Safely access nested properties
@@ -125,7 +147,7 @@ class VectorStore:
                     }
                 }]
                 try:
-                    resp, img_blobs = self.client.query(q_img)
+                    resp, img_blobs = client.query(q_img)
                     if img_blobs and len(img_blobs) > 0:
                         result["image_blob"] = img_blobs[0]
                 except Exception as e:
@@ -162,7 +184,8 @@ class VectorStore:
         }]
         
         print(f"🗑️  Deleting descriptor set: '{name_to_delete}'...")
-        response, _ = self.client.query(q)
+        response, _ = self.pool.query(q)
+        self.pool.mark_collection(name_to_delete, exists=False)
         
         if response[0]["DeleteDescriptorSet"]["status"] == 0:
             print(f"✓ Successfully deleted descriptor set '{name_to_delete}'")
@@ -209,7 +232,7 @@ class VectorStore:
                 queries.append(q)
         
         print(f"Deleting {len(queries)} descriptor(s)")
-        return self.client.query(queries)
+        return self.pool.query(queries)
 
     def add_image(self, image_path: str, metadata: dict):
         """
@@ -228,7 +251,7 @@ class VectorStore:
             }
         }]
         
-        response, _ = self.client.query(q, image_blob)
+        response, _ = self.pool.query(q, image_blob)
         return response
 
     def add_image_with_embedding(self, image_path: str, metadata: dict):
@@ -252,7 +275,7 @@ class VectorStore:
                 "if_not_found": {"id": ["==", metadata["id"]]}
             }
         }]
-        self.client.query(q_img, image_blob)
+        self.pool.query(q_img, image_blob)
 
         output = embed.image(
             images=[image_path],
@@ -269,6 +292,6 @@ class VectorStore:
                 "if_not_found": {"id": ["==", metadata["id"]]}
             }
         }]
-        self.client.query(q_desc, [embedding_bytes])
+        self.pool.query(q_desc, [embedding_bytes])
 
         return {"image_added": True, "embedding_shape": embedding.shape}
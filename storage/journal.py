@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+STAGES = ("ocr", "cleaned_text", "omission_info", "retrieved_documents", "verdicts")
+
+
+def _encode(value):
+    """json.dump fallback for the numpy values the pipeline produces."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} cannot be journaled")
+
+
+class Journal:
+    def __init__(self, directory: str):
+        """
+        Records the completed stages of a batch run so that an interrupted run can resume.
+        Each input asset gets one JSON file, named after the SHA-256 of its content,
+        holding the output of every stage in STAGES that has finished for it.
+        Stages made of many slow calls can also record their items one by one with
+        `record_item`, so a stage that fails part-way resumes from the last finished item.
+        Binary values (e.g. retrieved image blobs) are stored once under `blobs/`,
+        named by their own hash, and referenced from the JSON.
+
+        :param directory: Folder the journal files are written to.
+        """
+        self.directory = directory
+        self.blob_directory = os.path.join(directory, "blobs")
+        os.makedirs(self.blob_directory, exist_ok=True)
+
+    @staticmethod
+    def asset_key(path: str) -> str:
+        """Returns the SHA-256 hex digest of a file's content."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as fd:
+            for block in iter(lambda: fd.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _store_blobs(self, value):
+        """Replaces every bytes value with a reference to a file under `blobs/`."""
+        if isinstance(value, bytes):
+            digest = hashlib.sha256(value).hexdigest()
+            blob_path = os.path.join(self.blob_directory, digest)
+            if not os.path.exists(blob_path):
+                with open(blob_path + ".tmp", "wb") as fd:
+                    fd.write(value)
+                os.replace(blob_path + ".tmp", blob_path)
+            return {"__blob__": digest}
+        if isinstance(value, dict):
+            return {k: self._store_blobs(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._store_blobs(v) for v in value]
+        return value
+
+    def resolve_blobs(self, value):
+        """Replaces every blob reference in a loaded stage output with the blob's bytes."""
+        if isinstance(value, dict):
+            if set(value) == {"__blob__"}:
+                with open(os.path.join(self.blob_directory, value["__blob__"]), "rb") as fd:
+                    return fd.read()
+            return {k: self.resolve_blobs(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve_blobs(v) for v in value]
+        return value
+
+    def load(self, key: str) -> dict:
+        """
+        Returns the journal entry for an asset, or an empty entry if there is none.
+        Blob references are left as-is; pass a stage output to `resolve_blobs` when its bytes are needed.
+        """
+        try:
+            with open(self._path(key), "r") as fd:
+                return json.load(fd)
+        except FileNotFoundError:
+            return {"source": None, "stages": {}, "partial": {}}
+
+    def _write(self, key: str, entry: dict):
+        # Replace the file atomically, so a crash mid-write leaves the previous entry intact.
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w") as fd:
+            json.dump(entry, fd, default=_encode)
+        os.replace(tmp_path, self._path(key))
+
+    def record(self, key: str, stage: str, value, source: str = None):
+        """
+        Stores the output of a finished stage for an asset, replacing any partial items of that stage.
+
+        :param key: Asset key from `asset_key`.
+        :param stage: One of STAGES.
+        :param value: JSON-serializable stage output (bytes and numpy values are allowed).
+        :param source: Path of the asset, kept for reference.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Expected one of {STAGES}.")
+
+        entry = self.load(key)
+        if source is not None:
+            entry["source"] = source
+        entry["stages"][stage] = self._store_blobs(value)
+        entry.setdefault("partial", {}).pop(stage, None)
+        self._write(key, entry)
+
+    def record_item(self, key: str, stage: str, group: str, item: str, value):
+        """
+        Stores one finished item of a stage that is still in progress, so a failure part-way
+        through the stage does not lose the items already done.
+
+        :param key: Asset key from `asset_key`.
+        :param stage: One of STAGES.
+        :param group: Group the item belongs to (e.g. the observation category).
+        :param item: Name of the item within its group (e.g. the observation).
+        :param value: JSON-serializable output for the item.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Expected one of {STAGES}.")
+
+        entry = self.load(key)
+        partial = entry.setdefault("partial", {}).setdefault(stage, {})
+        partial.setdefault(group, {})[item] = self._store_blobs(value)
+        self._write(key, entry)
+
+    def load_items(self, key: str, stage: str) -> dict:
+        """Returns the items recorded so far for an unfinished stage, as {group: {item: value}}."""
+        return self.load(key).get("partial", {}).get(stage, {})
+
+    def first_incomplete_stage(self, key: str):
+        """Returns the first stage with no recorded output, or None if the asset is finished."""
+        done = self.load(key)["stages"]
+        for stage in STAGES:
+            if stage not in done:
+                return stage
+        return None
+
+    def is_complete(self, key: str) -> bool:
+        return self.first_incomplete_stage(key) is None
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from aperturedb.CommonLibrary import create_connector
+from dotenv import load_dotenv
+from extras.constants import CONFIG_PATH
+from extras.utils import read_yaml
+
+load_dotenv()
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+
+class ConnectionPool:
+    def __init__(self, size: int = DEFAULT_POOL_SIZE,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL):
+        """
+        A thread-safe pool of ApertureDB connectors.
+
+        Connectors are opened lazily, up to `size` at once. A connector that has been
+        idle for longer than `health_check_interval` seconds is checked with `GetStatus`
+        before being handed out, and replaced if the check fails. Callers waiting for a
+        connector are woken when one is released or a broken one is discarded.
+
+        :param size: Maximum number of open connectors.
+        :param health_check_interval: Idle time in seconds after which a connector is re-checked.
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._idle = []  # (client, last_used) pairs, most recently used last
+        self._opened = 0
+        self._lock = threading.Lock()
+        # Signalled whenever a connector is released or a slot is freed.
+        self._available = threading.Condition(self._lock)
+        self._known_collections = set()
+
+    def _connect(self):
+        return create_connector(key=os.getenv("APERTUREDB_API_KEY"))
+
+    def _is_healthy(self, client) -> bool:
+        try:
+            client.query([{"GetStatus": {}}])
+            return client.last_query_ok()
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float = None):
+        """
+        Takes a connector out of the pool, opening a new one if the pool is not full.
+        Blocks until one is released or a slot is freed otherwise.
+
+        :param timeout: Seconds to wait for a free connector. None waits forever.
+        :return: An ApertureDB connector for exclusive use by the caller.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._available:
+                while not self._idle and self._opened >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No ApertureDB connection available after {timeout}s.")
+                    self._available.wait(remaining)
+
+                if self._idle:
+                    client, last_used = self._idle.pop()
+                else:
+                    self._opened += 1
+                    client = None
+
+            if client is None:
+                return self._open()
+            if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(client):
+                self.discard(client)
+                continue
+            return client
+
+    def _open(self):
+        # The slot is already counted in self._opened; give it back if connecting fails.
+        try:
+            return self._connect()
+        except Exception:
+            with self._available:
+                self._opened -= 1
+                self._available.notify()
+            raise
+
+    def release(self, client):
+        """Returns a healthy connector to the pool."""
+        with self._available:
+            self._idle.append((client, time.monotonic()))
+            self._available.notify()
+
+    def discard(self, client):
+        """Closes and drops a broken connector so that a waiting or later `acquire` opens a fresh one."""
+        with self._available:
+            self._opened -= 1
+            self._available.notify()
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """
+        Context manager around `acquire`/`release`. If the block raises, the connector
+        is discarded only when it also fails a health check; errors unrelated to the
+        connection (e.g. a malformed query) leave it in the pool.
+        """
+        client = self.acquire(timeout=timeout)
+        try:
+            yield client
+        except Exception:
+            if self._is_healthy(client):
+                self.release(client)
+            else:
+                self.discard(client)
+            raise
+        self.release(client)
+
+    def query(self, q: list, blobs: list = None):
+        """Runs a single query on a pooled connector and returns (responses, blobs)."""
+        with self.connection() as client:
+            return client.query(q, blobs or [])
+
+    def is_known_collection(self, name: str) -> bool:
+        with self._lock:
+            return name in self._known_collections
+
+    def mark_collection(self, name: str, exists: bool = True):
+        """Records whether a descriptor set is known to exist on the server."""
+        with self._lock:
+            if exists:
+                self._known_collections.add(name)
+            else:
+                self._known_collections.discard(name)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Returns the process-wide connection pool, creating it from the config on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = read_yaml(CONFIG_PATH) or {}
+                _pool = ConnectionPool(
+                    size=config.get("db_pool_size", DEFAULT_POOL_SIZE),
+                    health_check_interval=config.get("db_health_check_interval", DEFAULT_HEALTH_CHECK_INTERVAL),
+                )
+    return _pool
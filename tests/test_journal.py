@@ -0,0 +1,37 @@
+import json
+import pytest
+
+pytest.importorskip("numpy")
+from storage.journal import Journal
+
+
+def test_blobs_are_stored_outside_the_entry(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.record("asset", "retrieved_documents", {"cat": {"obs": [{"id": "img_1", "image_blob": b"\x89PNG"}]}})
+
+    with open(tmp_path / "asset.json") as fd:
+        assert "PNG" not in fd.read()
+
+    stored = journal.load("asset")["stages"]["retrieved_documents"]
+    assert stored["cat"]["obs"][0]["image_blob"] != b"\x89PNG"
+    assert journal.resolve_blobs(stored)["cat"]["obs"][0]["image_blob"] == b"\x89PNG"
+
+
+def test_items_survive_until_the_stage_is_recorded(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.record_item("asset", "verdicts", "cat", "obs 1", {"status": "Fine", "reason": "ok"})
+
+    assert journal.load_items("asset", "verdicts") == {"cat": {"obs 1": {"status": "Fine", "reason": "ok"}}}
+    assert journal.first_incomplete_stage("asset") == "ocr"
+
+    for stage in ("ocr", "cleaned_text", "omission_info", "retrieved_documents", "verdicts"):
+        journal.record("asset", stage, [])
+
+    assert journal.is_complete("asset")
+    assert journal.load_items("asset", "verdicts") == {}
+
+
+def test_unknown_stage_is_rejected(tmp_path):
+    journal = Journal(str(tmp_path))
+    with pytest.raises(ValueError):
+        journal.record("asset", "embeddings", [])
@@ -0,0 +1,92 @@
+import threading
+import time
+import pytest
+
+pytest.importorskip("aperturedb")
+from storage.pool import ConnectionPool
+
+
+class StubConnector:
+    def __init__(self):
+        self.healthy = True
+        self.closed = False
+
+    def query(self, q, blobs=[]):
+        if not self.healthy:
+            raise ConnectionError("connection reset")
+        return [{"GetStatus": {"status": 0}}], []
+
+    def last_query_ok(self):
+        return self.healthy
+
+    def close(self):
+        self.closed = True
+
+
+class StubPool(ConnectionPool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened_clients = []
+
+    def _connect(self):
+        client = StubConnector()
+        self.opened_clients.append(client)
+        return client
+
+
+def test_discard_wakes_waiting_acquire():
+    pool = StubPool(size=1)
+    held = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+
+    time.sleep(0.1)
+    assert not acquired
+    pool.discard(held)
+    waiter.join(timeout=2)
+
+    assert not waiter.is_alive()
+    assert acquired and acquired[0] is not held
+    assert held.closed
+
+
+def test_unhealthy_idle_connector_is_replaced():
+    pool = StubPool(size=1, health_check_interval=0)
+    client = pool.acquire()
+    pool.release(client)
+    client.healthy = False
+
+    replacement = pool.acquire(timeout=1)
+
+    assert replacement is not client
+    assert client.closed
+    assert len(pool.opened_clients) == 2
+
+
+def test_application_error_keeps_healthy_connector():
+    pool = StubPool(size=1)
+    with pytest.raises(ValueError):
+        with pool.connection() as client:
+            raise ValueError("malformed query")
+
+    assert not client.closed
+    assert pool.acquire(timeout=1) is client
+
+
+def test_connection_error_discards_connector():
+    pool = StubPool(size=1)
+    with pytest.raises(ConnectionError):
+        with pool.connection() as client:
+            client.healthy = False
+            client.query([{"GetStatus": {}}])
+
+    assert client.closed
+    assert pool.acquire(timeout=1) is not client
+
+
+def test_acquire_times_out_when_pool_is_full():
+    pool = StubPool(size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)